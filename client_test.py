@@ -7,7 +7,7 @@ including schema introspection, CRUD operations, and advanced querying.
 """
 
 import asyncio
-import json
+import orjson
 from mcp.client.session import ClientSession
 from mcp.client.stdio import StdioServerParameters, stdio_client
 
@@ -20,7 +20,7 @@ async def test_health_and_info(session: ClientSession):
 
     print("\n Getting server info...")
     result = await session.call_tool("get_server_info", {})
-    server_info = json.loads(result.content[0].text)
+    server_info = orjson.loads(result.content[0].text)
     print(f"  Server: {server_info.get('server_name')}")
     print(f"  Database: {server_info.get('database')} @ {server_info.get('host')}:{server_info.get('port')}")
     print(f"  Status: {server_info.get('status')}")
@@ -30,7 +30,7 @@ async def test_schema_introspection(session: ClientSession):
     """Test schema introspection tools"""
     print("\n Listing tables...")
     result = await session.call_tool("list_tables", {})
-    tables = json.loads(result.content[0].text)
+    tables = orjson.loads(result.content[0].text)
     print(f"  Found {len(tables)} tables:")
     for table in tables[:5]:  # Show first 5 tables
         print(f"    - {table['table_name']} ({table['table_type']})")
@@ -39,7 +39,7 @@ async def test_schema_introspection(session: ClientSession):
         table_name = tables[0]['table_name']
         print(f"\n Describing table '{table_name}'...")
         result = await session.call_tool("describe_table", {"table_name": table_name})
-        table_info = json.loads(result.content[0].text)
+        table_info = orjson.loads(result.content[0].text)
         print(f"  Columns: {len(table_info['columns'])}")
         print(f"  Constraints: {len(table_info['constraints'])}")
         print(f"  Indexes: {len(table_info['indexes'])}")
@@ -56,7 +56,7 @@ async def test_crud_operations(session: ClientSession):
         "table_name": "items",
         "data": insert_data
     })
-    insert_result = json.loads(result.content[0].text)
+    insert_result = orjson.loads(result.content[0].text)
     print(f"  Insert success: {insert_result['success']}")
 
     if insert_result['success']:
@@ -70,7 +70,7 @@ async def test_crud_operations(session: ClientSession):
             "where_params": [record_id],
             "limit": 1
         })
-        select_result = json.loads(result.content[0].text)
+        select_result = orjson.loads(result.content[0].text)
         print(f"  Found {select_result['returned_count']} record(s)")
 
         print("\n Testing UPDATE operation...")
@@ -81,7 +81,7 @@ async def test_crud_operations(session: ClientSession):
             "where_clause": "id = $1",
             "where_params": [record_id]
         })
-        update_result = json.loads(result.content[0].text)
+        update_result = orjson.loads(result.content[0].text)
         print(f"  Update success: {update_result['success']}")
         print(f"  Rows affected: {update_result['rows_affected']}")
 
@@ -91,7 +91,7 @@ async def test_crud_operations(session: ClientSession):
             "where_clause": "id = $1",
             "where_params": [record_id]
         })
-        delete_result = json.loads(result.content[0].text)
+        delete_result = orjson.loads(result.content[0].text)
         print(f"  Delete success: {delete_result['success']}")
         print(f"  Rows affected: {delete_result['rows_affected']}")
 
@@ -105,7 +105,7 @@ async def test_advanced_queries(session: ClientSession):
         "limit": 3,
         "offset": 0
     })
-    select_result = json.loads(result.content[0].text)
+    select_result = orjson.loads(result.content[0].text)
     print(f"  Total records: {select_result['total_count']}")
     print(f"  Returned: {select_result['returned_count']}")
 
@@ -113,7 +113,7 @@ async def test_advanced_queries(session: ClientSession):
     result = await session.call_tool("get_table_statistics", {
         "table_name": "items"
     })
-    stats = json.loads(result.content[0].text)
+    stats = orjson.loads(result.content[0].text)
     print(f"  Row count: {stats['row_count']}")
     if 'size_info' in stats and stats['size_info']:
         print(f"  Table size: {stats['size_info'].get('table_size', 'Unknown')}")
@@ -127,7 +127,7 @@ async def test_custom_query(session: ClientSession):
         "query": custom_query,
         "query_type": "SELECT"
     })
-    query_result = json.loads(result.content[0].text)
+    query_result = orjson.loads(result.content[0].text)
     print(f"  Query success: {query_result['success']}")
     if query_result['success'] and query_result['records']:
         print(f"  Total items: {query_result['records'][0]['total_items']}")
@@ -0,0 +1,64 @@
+"""
+Database Configuration for PostgreSQL MCP Server
+
+This module reads the PostgreSQL connection settings from the environment
+(and the project's .env file) once at import time, so the server, the
+connection utilities and the init script all share a single parsed copy.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+@dataclass(frozen=True, slots=True)
+class PgConfig:
+    """PostgreSQL connection settings"""
+    host: str
+    port: int
+    user: Optional[str]
+    password: Optional[str]
+    database: Optional[str]
+    pool_min_size: int = 2
+    pool_max_size: int = 20
+
+    @classmethod
+    def from_env(cls) -> "PgConfig":
+        """Build the configuration from PG_* environment variables"""
+        return cls(
+            host=os.getenv("PG_HOST", "localhost"),
+            port=int(os.getenv("PG_PORT", 5432)),
+            user=os.getenv("PG_USER"),
+            password=os.getenv("PG_PASSWORD"),
+            database=os.getenv("PG_DATABASE"),
+            pool_min_size=int(os.getenv("PG_POOL_MIN", 2)),
+            pool_max_size=int(os.getenv("PG_POOL_MAX", 20)),
+        )
+
+    def missing_vars(self) -> List[str]:
+        """Names of required environment variables that are not set"""
+        required = {
+            "PG_USER": self.user,
+            "PG_PASSWORD": self.password,
+            "PG_DATABASE": self.database,
+        }
+        return [name for name, value in required.items() if not value]
+
+    def connect_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for asyncpg.connect / asyncpg.create_pool"""
+        return {
+            "host": self.host,
+            "port": self.port,
+            "user": self.user,
+            "password": self.password,
+            "database": self.database,
+        }
+
+
+# Parsed once and shared by every module
+CONFIG = PgConfig.from_env()
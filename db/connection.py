@@ -8,29 +8,28 @@ Note: This module is kept for backward compatibility with existing tests.
 The main MCP server uses its own connection management in postgres_mcp_server.py
 """
 
-import os
 import logging
 from typing import Optional
 
 import asyncpg
-from dotenv import load_dotenv
+
+from db.config import CONFIG
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
-
-# Read connection settings from environment
-PG_HOST = os.getenv("PG_HOST", "localhost")
-PG_PORT = int(os.getenv("PG_PORT", 5432))
-PG_USER = os.getenv("PG_USER")
-PG_PASSWORD = os.getenv("PG_PASSWORD")
-PG_DATABASE = os.getenv("PG_DATABASE")
-
 # Global pool object
 _pool: Optional[asyncpg.Pool] = None
 
+VERSION_QUERY = "SELECT version()"
+DATABASE_SIZE_QUERY = "SELECT pg_size_pretty(pg_database_size($1))"
+
+
+async def _warm_statements(conn: asyncpg.Connection) -> None:
+    """Prepare the queries this module runs on a newly opened pool connection"""
+    await conn.fetchval(VERSION_QUERY)
+    await conn.fetchval(DATABASE_SIZE_QUERY, CONFIG.database)
+
 
 async def init_db_pool():
     """
@@ -41,16 +40,18 @@ async def init_db_pool():
     if _pool is None:
         try:
             _pool = await asyncpg.create_pool(
-                host=PG_HOST,
-                port=PG_PORT,
-                user=PG_USER,
-                password=PG_PASSWORD,
-                database=PG_DATABASE,
-                min_size=1,
-                max_size=10,
+                **CONFIG.connect_kwargs(),
+                min_size=CONFIG.pool_min_size,
+                max_size=CONFIG.pool_max_size,
                 command_timeout=60,
+                # Reuse connections (and their statement caches) for as long
+                # as possible instead of reconnecting every 50000 queries
+                max_queries=1_000_000,
+                max_inactive_connection_lifetime=600,
+                statement_cache_size=1024,
+                init=_warm_statements,
             )
-            logger.info(f"Database pool initialized: {PG_DATABASE}@{PG_HOST}:{PG_PORT}")
+            logger.info(f"Database pool initialized: {CONFIG.database}@{CONFIG.host}:{CONFIG.port}")
         except Exception as e:
             logger.error(f"Failed to initialize database pool: {e}")
             raise
@@ -80,18 +81,13 @@ async def close_db_pool():
 async def test_connection() -> bool:
     """
     Test the database connection with current settings.
+    Uses the shared pool, initializing it on first use.
     Returns True if connection is successful, False otherwise.
     """
     try:
-        conn = await asyncpg.connect(
-            host=PG_HOST,
-            port=PG_PORT,
-            user=PG_USER,
-            password=PG_PASSWORD,
-            database=PG_DATABASE
-        )
-        await conn.fetchval("SELECT 1")
-        await conn.close()
+        pool = await init_db_pool()
+        async with pool.acquire() as conn:
+            await conn.fetchval("SELECT 1")
         return True
     except Exception as e:
         logger.error(f"Database connection test failed: {e}")
@@ -100,33 +96,21 @@ async def test_connection() -> bool:
 
 async def get_database_info() -> dict:
     """
-    Get basic information about the database.
+    Get basic information about the database using the shared pool.
     """
     try:
-        conn = await asyncpg.connect(
-            host=PG_HOST,
-            port=PG_PORT,
-            user=PG_USER,
-            password=PG_PASSWORD,
-            database=PG_DATABASE
-        )
-
-        version = await conn.fetchval("SELECT version()")
-        db_size = await conn.fetchval(
-            "SELECT pg_size_pretty(pg_database_size($1))",
-            PG_DATABASE
-        )
-
-        await conn.close()
+        pool = await init_db_pool()
+        async with pool.acquire() as conn:
+            version = await conn.fetchval(VERSION_QUERY)
+            db_size = await conn.fetchval(DATABASE_SIZE_QUERY, CONFIG.database)
 
         return {
-            "host": PG_HOST,
-            "port": PG_PORT,
-            "database": PG_DATABASE,
+            "host": CONFIG.host,
+            "port": CONFIG.port,
+            "database": CONFIG.database,
             "version": version,
             "size": db_size
         }
     except Exception as e:
         logger.error(f"Failed to get database info: {e}")
         return {}
-
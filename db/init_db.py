@@ -16,62 +16,47 @@ Environment Variables Required:
 """
 
 import asyncio
-import os
 import sys
 from pathlib import Path
 
 import asyncpg
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Make the project root importable when run as `python db/init_db.py`
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-# Database configuration
-PG_HOST = os.getenv("PG_HOST", "localhost")
-PG_PORT = int(os.getenv("PG_PORT", 5432))
-PG_USER = os.getenv("PG_USER")
-PG_PASSWORD = os.getenv("PG_PASSWORD")
-PG_DATABASE = os.getenv("PG_DATABASE")
+from db.config import CONFIG
 
 
-async def check_connection():
+async def open_connection():
+    """Open the connection shared by all initialization steps"""
+    try:
+        return await asyncpg.connect(**CONFIG.connect_kwargs())
+    except Exception as e:
+        print(f"Failed to connect to database: {e}")
+        return None
+
+
+async def check_connection(conn: asyncpg.Connection):
     """Test the database connection"""
     try:
-        conn = await asyncpg.connect(
-            host=PG_HOST,
-            port=PG_PORT,
-            user=PG_USER,
-            password=PG_PASSWORD,
-            database=PG_DATABASE
-        )
         await conn.fetchval("SELECT 1")
-        await conn.close()
-        print(f"Successfully connected to {PG_DATABASE}@{PG_HOST}:{PG_PORT}")
+        print(f"Successfully connected to {CONFIG.database}@{CONFIG.host}:{CONFIG.port}")
         return True
     except Exception as e:
         print(f"Failed to connect to database: {e}")
         return False
 
 
-async def run_sql_file(file_path: Path):
+async def run_sql_file(conn: asyncpg.Connection, file_path: Path):
     """Execute SQL commands from a file"""
     if not file_path.exists():
         print(f"SQL file not found: {file_path}")
         return False
     
     try:
-        conn = await asyncpg.connect(
-            host=PG_HOST,
-            port=PG_PORT,
-            user=PG_USER,
-            password=PG_PASSWORD,
-            database=PG_DATABASE
-        )
-        
         # Read and execute the SQL file
         sql_content = file_path.read_text(encoding='utf-8')
         await conn.execute(sql_content)
-        await conn.close()
         
         print(f"Successfully executed SQL file: {file_path.name}")
         return True
@@ -80,26 +65,24 @@ async def run_sql_file(file_path: Path):
         return False
 
 
-async def verify_schema():
+async def verify_schema(conn: asyncpg.Connection):
     """Verify that the schema was created correctly"""
     try:
-        conn = await asyncpg.connect(
-            host=PG_HOST,
-            port=PG_PORT,
-            user=PG_USER,
-            password=PG_PASSWORD,
-            database=PG_DATABASE
-        )
-        
-        # Check if tables exist
-        tables = await conn.fetch("""
-            SELECT table_name 
-            FROM information_schema.tables 
-            WHERE table_schema = 'public' 
-            ORDER BY table_name
+        # Fetch the table list and sample data counts in one round-trip
+        summary = await conn.fetchrow("""
+            SELECT
+                ARRAY(
+                    SELECT table_name::text
+                    FROM information_schema.tables
+                    WHERE table_schema = 'public'
+                    ORDER BY table_name
+                ) AS table_names,
+                (SELECT COUNT(*) FROM items) AS items_count,
+                (SELECT COUNT(*) FROM users) AS users_count,
+                (SELECT COUNT(*) FROM products) AS products_count
         """)
         
-        table_names = [row['table_name'] for row in tables]
+        table_names = summary['table_names']
         expected_tables = ['items', 'products', 'users', 'orders', 'order_items']
         
         print("\nDatabase Tables:")
@@ -107,17 +90,11 @@ async def verify_schema():
             status = "YES" if table in expected_tables else "NO"
             print(f"  {status} {table}")
         
-        # Check sample data
-        items_count = await conn.fetchval("SELECT COUNT(*) FROM items")
-        users_count = await conn.fetchval("SELECT COUNT(*) FROM users")
-        products_count = await conn.fetchval("SELECT COUNT(*) FROM products")
-        
         print(f"\nSample Data:")
-        print(f"  Items: {items_count} records")
-        print(f"  Users: {users_count} records")
-        print(f"  Products: {products_count} records")
+        print(f"  Items: {summary['items_count']} records")
+        print(f"  Users: {summary['users_count']} records")
+        print(f"  Products: {summary['products_count']} records")
         
-        await conn.close()
         return True
     except Exception as e:
         print(f"Failed to verify schema: {e}")
@@ -129,33 +106,36 @@ async def main():
     print("Initializing PostgreSQL database for PostgreSQL MCP Server...")
     
     # Validate required environment variables
-    required_vars = ["PG_USER", "PG_PASSWORD", "PG_DATABASE"]
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    missing_vars = CONFIG.missing_vars()
     if missing_vars:
         print(f"Missing required environment variables: {', '.join(missing_vars)}")
         print("Please set these variables in your .env file in the project root")
         sys.exit(1)
     
     # Check database connection
-    if not await check_connection():
+    conn = await open_connection()
+    if conn is None or not await check_connection(conn):
         print("Cannot proceed without database connection")
         sys.exit(1)
     
-    # Get the directory containing this script
-    script_dir = Path(__file__).parent
-    schema_file = script_dir / "schema.sql"
-    
-    # Run the schema initialization
-    print("\nCreating database schema...")
-    if not await run_sql_file(schema_file):
-        print("Failed to initialize database schema")
-        sys.exit(1)
-    
-    # Verify the schema
-    print("\nVerifying database schema...")
-    if not await verify_schema():
-        print("Schema verification failed")
-        sys.exit(1)
+    try:
+        # Get the directory containing this script
+        script_dir = Path(__file__).parent
+        schema_file = script_dir / "schema.sql"
+        
+        # Run the schema initialization
+        print("\nCreating database schema...")
+        if not await run_sql_file(conn, schema_file):
+            print("Failed to initialize database schema")
+            sys.exit(1)
+        
+        # Verify the schema
+        print("\nVerifying database schema...")
+        if not await verify_schema(conn):
+            print("Schema verification failed")
+            sys.exit(1)
+    finally:
+        await conn.close()
     
     print("\nDatabase initialization completed successfully!")
     print("\nYou can now run the PostgreSQL MCP server:")
@@ -29,66 +29,433 @@ Environment Variables Required:
     PG_DATABASE: PostgreSQL database name (required)
 """
 
-import os
-import json
+import asyncio
+import functools
 import logging
-from typing import Optional, Dict, List, Any
+import re
+from typing import Optional, Dict, List, Any, FrozenSet, Iterable, Mapping, Sequence, Tuple
 from contextlib import asynccontextmanager
 from collections.abc import AsyncIterator
-from datetime import datetime, date
+from decimal import Decimal
+from types import MappingProxyType
 
 import asyncpg
-from dotenv import load_dotenv
+import orjson
 from mcp.server.fastmcp import FastMCP, Context
 
+from db.config import CONFIG
+
+# The libuv-based event loop is not available on Windows
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
+SERVER_NAME = "PostgreSQL MCP Server"
 
-# Database configuration
-PG_HOST = os.getenv("PG_HOST", "localhost")
-PG_PORT = int(os.getenv("PG_PORT", 5432))
-PG_USER = os.getenv("PG_USER")
-PG_PASSWORD = os.getenv("PG_PASSWORD")
-PG_DATABASE = os.getenv("PG_DATABASE")
+# ping is used as a keepalive, so its reply is built once
+_PONG = "pong"
+
+
+class Session:
+    """A pooled connection held for the duration of one tool call"""
+    
+    def __init__(self, conn: asyncpg.Connection):
+        self.conn = conn
+    
+    async def fetch(self, query: str, *args) -> List[asyncpg.Record]:
+        """Execute a SELECT query and return the result rows"""
+        return await self.conn.fetch(query, *args)
+    
+    async def fetchrow(self, query: str, *args) -> Optional[asyncpg.Record]:
+        """Execute a query that returns a single row"""
+        return await self.conn.fetchrow(query, *args)
+    
+    async def fetchval(self, query: str, *args) -> Any:
+        """Execute a query and return the first column of its first row"""
+        return await self.conn.fetchval(query, *args)
+    
+    async def execute(self, query: str, *args) -> str:
+        """Execute a command and return its status"""
+        return await self.conn.execute(query, *args)
+    
+    async def execute_many(self, query: str, args_iter: Iterable[Sequence[Any]]) -> None:
+        """Execute a command once for each argument sequence in a single network batch"""
+        await self.conn.executemany(query, args_iter)
+    
+    async def copy_records(
+        self,
+        table_name: str,
+        records: Iterable[Sequence[Any]],
+        columns: List[str],
+        schema: str = "public"
+    ) -> str:
+        """Bulk-load records into a table with the binary COPY protocol and return status"""
+        return await self.conn.copy_records_to_table(
+            table_name,
+            records=records,
+            columns=columns,
+            schema_name=schema
+        )
+    
+    @asynccontextmanager
+    async def transaction(self, force_custom_plan: bool = False, jit: bool = False) -> AsyncIterator[None]:
+        """
+        Run the enclosed queries in one transaction. With force_custom_plan,
+        PostgreSQL plans every execution for its actual parameters instead of
+        switching cached statements to a generic plan. With jit, JIT
+        compilation is re-enabled for the transaction (the pool turns it off
+        for the server's own queries).
+        """
+        settings = []
+        if force_custom_plan:
+            settings.append("SET LOCAL plan_cache_mode = force_custom_plan")
+        if jit:
+            settings.append("SET LOCAL jit = on")
+        async with self.conn.transaction():
+            if settings:
+                await self.conn.execute("; ".join(settings))
+            yield
+    
+    async def iter_query(
+        self,
+        query: str,
+        *args,
+        prefetch: int = 1000,
+        force_custom_plan: bool = False,
+        jit: bool = False
+    ) -> AsyncIterator[asyncpg.Record]:
+        """Stream the rows of a SELECT query through a server-side cursor, `prefetch` rows at a time"""
+        async with self.transaction(force_custom_plan, jit):
+            async for row in self.conn.cursor(query, *args, prefetch=prefetch):
+                yield row
 
 
 class DatabaseContext:
     """Database context for the MCP server with connection pooling and utilities"""
     
-    def __init__(self, pool: asyncpg.Pool):
+    def __init__(self, pool: asyncpg.Pool, static_info: Mapping[str, Any]):
         self.pool = pool
+        # Server details that never change while the server runs
+        self.static_info = static_info
+        # Column names of every known table, keyed by (schema, table)
+        self.table_columns: Dict[Tuple[str, str], FrozenSet[str]] = {}
     
-    async def execute_query(self, query: str, *args) -> List[Dict[str, Any]]:
-        """Execute a SELECT query and return results as list of dictionaries"""
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[Session]:
+        """Acquire one pooled connection for a sequence of queries"""
         async with self.pool.acquire() as conn:
-            rows = await conn.fetch(query, *args)
-            return [dict(row) for row in rows]
+            yield Session(conn)
     
-    async def execute_single(self, query: str, *args) -> Optional[Dict[str, Any]]:
+    async def execute_query(self, query: str, *args) -> List[asyncpg.Record]:
+        """Execute a SELECT query and return the result rows as asyncpg records"""
+        async with self.session() as session:
+            return await session.fetch(query, *args)
+    
+    async def iter_query(
+        self,
+        query: str,
+        *args,
+        prefetch: int = 1000,
+        force_custom_plan: bool = False,
+        jit: bool = False
+    ) -> AsyncIterator[asyncpg.Record]:
+        """Stream the rows of a SELECT query through a server-side cursor, `prefetch` rows at a time"""
+        async with self.session() as session:
+            async for row in session.iter_query(
+                query, *args, prefetch=prefetch, force_custom_plan=force_custom_plan, jit=jit
+            ):
+                yield row
+    
+    async def execute_single(self, query: str, *args) -> Optional[asyncpg.Record]:
         """Execute a query that returns a single row"""
-        async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(query, *args)
-            return dict(row) if row else None
+        async with self.session() as session:
+            return await session.fetchrow(query, *args)
+    
+    async def execute_scalar(self, query: str, *args) -> Any:
+        """Execute a query that returns a single value"""
+        async with self.session() as session:
+            return await session.fetchval(query, *args)
     
     async def execute_command(self, query: str, *args) -> str:
         """Execute an INSERT/UPDATE/DELETE command and return status"""
-        async with self.pool.acquire() as conn:
-            result = await conn.execute(query, *args)
-            return result
+        async with self.session() as session:
+            return await session.execute(query, *args)
+    
+    async def execute_many(self, query: str, args_iter: Iterable[Sequence[Any]]) -> None:
+        """Execute a command once for each argument sequence in a single network batch"""
+        async with self.session() as session:
+            await session.execute_many(query, args_iter)
+    
+    async def copy_records(
+        self,
+        table_name: str,
+        records: Iterable[Sequence[Any]],
+        columns: List[str],
+        schema: str = "public"
+    ) -> str:
+        """Bulk-load records into a table with the binary COPY protocol and return status"""
+        async with self.session() as session:
+            return await session.copy_records(table_name, records, columns, schema)
+    
+    async def load_table_columns(self) -> None:
+        """Cache the column names of every user table"""
+        rows = await self.execute_query(ALL_TABLE_COLUMNS_QUERY)
+        self.table_columns = {
+            (row["table_schema"], row["table_name"]): frozenset(row["columns"])
+            for row in rows
+        }
+    
+    async def check_identifiers(self, schema: str, table_name: str, columns: Iterable[str] = ()) -> None:
+        """
+        Raise ValueError unless the table and all of the given columns exist.
+        Names are quoted in the generated SQL, so they must match the catalog
+        exactly. A miss re-reads the table from the catalog in case it was
+        created or altered since it was cached.
+        """
+        key = (schema, table_name)
+        columns = tuple(columns)
+        known = self.table_columns.get(key)
+        if known is not None and known.issuperset(columns):
+            return
+        
+        table_columns = await self.execute_scalar(TABLE_COLUMNS_QUERY, *key)
+        if table_columns is None:
+            self.table_columns.pop(key, None)
+            raise ValueError(f"Table '{schema}.{table_name}' not found")
+        known = self.table_columns[key] = frozenset(table_columns)
+        
+        unknown = [column for column in columns if column not in known]
+        if unknown:
+            raise ValueError(f"Unknown column(s) in '{schema}.{table_name}': {', '.join(unknown)}")
     
     def serialize_value(self, value: Any) -> Any:
-        """Serialize database values for JSON compatibility"""
-        if isinstance(value, (datetime, date)):
-            return value.isoformat()
-        elif isinstance(value, (list, tuple)):
-            return [self.serialize_value(v) for v in value]
-        elif isinstance(value, dict):
-            return {k: self.serialize_value(v) for k, v in value.items()}
-        return value
+        """Convert values orjson cannot encode natively (used as its `default` hook)"""
+        if isinstance(value, asyncpg.Record):
+            return dict(value)
+        elif isinstance(value, Decimal):
+            return str(value)
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+    
+    def encode_record(self, record: Mapping[str, Any]) -> bytes:
+        """Encode a single record as JSON"""
+        return orjson.dumps(record, default=self.serialize_value)
+    
+    def to_json(self, value: Any) -> str:
+        """Encode a tool result as JSON; records and datetimes are handled without a separate pass"""
+        return orjson.dumps(value, default=self.serialize_value).decode()
+    
+    def encode_records_response(self, encoded_records: List[bytes], **fields) -> str:
+        """Build a JSON response from records that were already encoded one by one"""
+        return (b'{"records":[' + b",".join(encoded_records) + b"]," + orjson.dumps(fields)[1:]).decode()
+
+
+# =============================================================================
+# HOT METADATA QUERIES
+# =============================================================================
+
+# asyncpg keeps a per-connection cache of prepared statements keyed by query
+# text, and it survives pool checkouts. These queries run on every call of
+# their tools, so they are prepared once when the pool opens a connection
+# (see warm_statement_cache) and later calls skip the parse/plan step.
+
+# These read pg_catalog directly: the information_schema views join many
+# more catalogs and run privilege checks on every row
+
+LIST_TABLES_QUERY = """
+    SELECT
+        c.relname::text AS table_name,
+        CASE c.relkind
+            WHEN 'r' THEN 'BASE TABLE'
+            WHEN 'p' THEN 'BASE TABLE'
+            WHEN 'v' THEN 'VIEW'
+            WHEN 'm' THEN 'MATERIALIZED VIEW'
+            WHEN 'f' THEN 'FOREIGN'
+        END AS table_type,
+        CASE
+            WHEN c.relkind IN ('r', 'p') THEN 'YES'
+            WHEN c.relkind IN ('v', 'f') AND pg_relation_is_updatable(c.oid, false) & 8 = 8 THEN 'YES'
+            ELSE 'NO'
+        END AS is_insertable_into
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = $1 AND c.relkind IN ('r', 'v', 'm', 'f', 'p')
+    ORDER BY c.relname
+"""
+
+# Columns, constraints and indexes in one tagged result set. Each row's
+# `info` is built server-side with exactly the keys describe_table returns,
+# so the json codec decodes it straight into the output dict. Lengths and
+# precisions come from the same helpers information_schema.columns uses.
+DESCRIBE_TABLE_QUERY = """
+    WITH tbl AS (
+        SELECT c.oid
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = $1 AND c.relname = $2
+    )
+    SELECT
+        'column' AS kind,
+        a.attnum::int AS position,
+        json_build_object(
+            'column_name', a.attname,
+            'data_type', format_type(a.atttypid, NULL),
+            'is_nullable', CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END,
+            'column_default', CASE WHEN a.attgenerated = '' THEN pg_get_expr(d.adbin, d.adrelid) END,
+            'character_maximum_length', information_schema._pg_char_max_length(
+                information_schema._pg_truetypid(a.*, t.*),
+                information_schema._pg_truetypmod(a.*, t.*)
+            ),
+            'numeric_precision', information_schema._pg_numeric_precision(
+                information_schema._pg_truetypid(a.*, t.*),
+                information_schema._pg_truetypmod(a.*, t.*)
+            ),
+            'numeric_scale', information_schema._pg_numeric_scale(
+                information_schema._pg_truetypid(a.*, t.*),
+                information_schema._pg_truetypmod(a.*, t.*)
+            ),
+            'ordinal_position', a.attnum
+        ) AS info
+    FROM pg_attribute a
+    JOIN tbl ON a.attrelid = tbl.oid
+    JOIN pg_type t ON t.oid = a.atttypid
+    LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+    WHERE a.attnum > 0 AND NOT a.attisdropped
+    UNION ALL
+    SELECT
+        'constraint',
+        NULL,
+        json_build_object(
+            'constraint_name', con.conname,
+            'constraint_type', CASE con.contype
+                WHEN 'p' THEN 'PRIMARY KEY'
+                WHEN 'f' THEN 'FOREIGN KEY'
+                WHEN 'u' THEN 'UNIQUE'
+                WHEN 'c' THEN 'CHECK'
+            END,
+            'column_name', a.attname
+        )
+    FROM pg_constraint con
+    JOIN tbl ON con.conrelid = tbl.oid
+    CROSS JOIN LATERAL unnest(con.conkey) AS key(attnum)
+    JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = key.attnum
+    WHERE con.contype IN ('p', 'f', 'u', 'c')
+    UNION ALL
+    SELECT
+        'index',
+        NULL,
+        json_build_object('indexname', i.relname, 'indexdef', pg_get_indexdef(i.oid))
+    FROM pg_index x
+    JOIN tbl ON x.indrelid = tbl.oid
+    JOIN pg_class i ON i.oid = x.indexrelid
+    ORDER BY kind, position
+"""
+
+# Column names per table, used to validate identifiers before they are
+# formatted into generated SQL
+ALL_TABLE_COLUMNS_QUERY = """
+    SELECT
+        n.nspname::text AS table_schema,
+        c.relname::text AS table_name,
+        array_agg(a.attname::text) AS columns
+    FROM pg_attribute a
+    JOIN pg_class c ON c.oid = a.attrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE c.relkind IN ('r', 'v', 'm', 'f', 'p')
+        AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+        AND a.attnum > 0 AND NOT a.attisdropped
+    GROUP BY n.nspname, c.relname
+"""
+
+TABLE_COLUMNS_QUERY = """
+    SELECT array_agg(a.attname::text) AS columns
+    FROM pg_attribute a
+    JOIN pg_class c ON c.oid = a.attrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = $1 AND c.relname = $2
+        AND c.relkind IN ('r', 'v', 'm', 'f', 'p')
+        AND a.attnum > 0 AND NOT a.attisdropped
+"""
+
+SERVER_INFO_QUERY = "SELECT version() AS version, pg_size_pretty(pg_database_size($1)) AS size"
+
+TABLE_INFO_QUERY = """
+    SELECT
+        schemaname,
+        tablename,
+        tableowner,
+        hasindexes,
+        hasrules,
+        hastriggers
+    FROM pg_tables
+    WHERE schemaname = $1 AND tablename = $2
+"""
+
+TABLE_SIZE_QUERY = """
+    SELECT
+        pg_size_pretty(pg_total_relation_size($1)) as total_size,
+        pg_size_pretty(pg_relation_size($1)) as table_size,
+        pg_size_pretty(pg_total_relation_size($1) - pg_relation_size($1)) as index_size
+"""
+
+# Each hot query with harmless arguments to run it with while warming
+WARM_QUERIES = [
+    (LIST_TABLES_QUERY, "public"),
+    (DESCRIBE_TABLE_QUERY, "public", ""),
+    (SERVER_INFO_QUERY, CONFIG.database),
+    (TABLE_INFO_QUERY, "public", ""),
+    (TABLE_SIZE_QUERY, "pg_catalog.pg_class"),
+]
+
+
+async def warm_statement_cache(conn: asyncpg.Connection) -> None:
+    """Prepare the hot metadata queries on a newly opened pool connection"""
+    for query, *args in WARM_QUERIES:
+        await conn.fetch(query, *args)
+
+
+def encode_json(value: Any) -> bytes:
+    """Encode a json parameter; strings are passed through as JSON text"""
+    if isinstance(value, str):
+        return value.encode()
+    return orjson.dumps(value)
+
+
+def encode_jsonb(value: Any) -> bytes:
+    """Encode a jsonb parameter in the binary format (version byte, then JSON text)"""
+    return b"\x01" + encode_json(value)
+
+
+def decode_jsonb(data: bytes) -> Any:
+    """Decode a binary jsonb value, skipping its version byte"""
+    return orjson.loads(data[1:])
+
+
+async def init_connection(conn: asyncpg.Connection) -> None:
+    """Set up a newly opened pool connection"""
+    # Decode json/jsonb into Python objects once, in the driver, so results
+    # are returned as nested JSON instead of escaped strings. The binary
+    # format is required by COPY, which insert_records uses for large batches.
+    await conn.set_type_codec(
+        "json",
+        encoder=encode_json,
+        decoder=orjson.loads,
+        schema="pg_catalog",
+        format="binary"
+    )
+    await conn.set_type_codec(
+        "jsonb",
+        encoder=encode_jsonb,
+        decoder=decode_jsonb,
+        schema="pg_catalog",
+        format="binary"
+    )
+    # Registering codecs clears the statement cache, so warm it afterwards
+    await warm_statement_cache(conn)
 
 
 @asynccontextmanager
@@ -97,30 +464,48 @@ async def server_lifespan(_: FastMCP) -> AsyncIterator[DatabaseContext]:
     logger.info("Starting PostgreSQL MCP Server...")
     
     # Validate required environment variables
-    required_vars = ["PG_USER", "PG_PASSWORD", "PG_DATABASE"]
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    missing_vars = CONFIG.missing_vars()
     if missing_vars:
         raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
     
     # Initialize database pool on startup
     try:
         pool = await asyncpg.create_pool(
-            host=PG_HOST,
-            port=PG_PORT,
-            user=PG_USER,
-            password=PG_PASSWORD,
-            database=PG_DATABASE,
-            min_size=2,
-            max_size=20,
+            **CONFIG.connect_kwargs(),
+            min_size=CONFIG.pool_min_size,
+            max_size=CONFIG.pool_max_size,
             command_timeout=60,
+            # Reconnecting would discard the warmed statement cache, so
+            # connections are only recycled after a million queries
+            max_queries=1_000_000,
+            # Keep prepared plans for the repeated metadata/CRUD statements
+            # for the lifetime of each connection
+            statement_cache_size=1024,
+            max_cached_statement_lifetime=0,
+            max_inactive_connection_lifetime=300,
+            # JIT compilation costs more than it saves on the small catalog
+            # queries this server issues; custom SELECTs turn it back on
+            server_settings={"jit": "off", "application_name": "postgres-mcp-server"},
+            init=init_connection,
         )
-        logger.info(f"Connected to PostgreSQL database: {PG_DATABASE}@{PG_HOST}:{PG_PORT}")
+        logger.info(f"Connected to PostgreSQL database: {CONFIG.database}@{CONFIG.host}:{CONFIG.port}")
         
         # Test the connection
         async with pool.acquire() as conn:
             await conn.fetchval("SELECT 1")
         
-        yield DatabaseContext(pool=pool)
+        db_ctx = DatabaseContext(
+            pool=pool,
+            static_info=MappingProxyType({
+                "server_name": SERVER_NAME,
+                "database": CONFIG.database,
+                "host": CONFIG.host,
+                "port": CONFIG.port
+            })
+        )
+        await db_ctx.load_table_columns()
+        
+        yield db_ctx
         
     except Exception as e:
         logger.error(f"Failed to connect to database: {e}")
@@ -132,57 +517,195 @@ async def server_lifespan(_: FastMCP) -> AsyncIterator[DatabaseContext]:
             logger.info("Database connection pool closed")
 
 
+def normalize_query(query: str) -> str:
+    """Strip surrounding whitespace and trailing semicolons from a custom query"""
+    return query.strip().rstrip(";").rstrip()
+
+
+# Plain PostgreSQL identifiers (at most 63 bytes)
+_IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]{0,62}")
+
+
+@functools.lru_cache(maxsize=1024)
+def _qi(name: str) -> str:
+    """Validate an identifier and return it double-quoted for use in SQL"""
+    if not _IDENT_RE.fullmatch(name):
+        raise ValueError(f"Invalid identifier: {name!r}")
+    return f'"{name}"'
+
+
+# $n parameter placeholders in caller-supplied SQL fragments
+_PH_RE = re.compile(r"\$(\d+)")
+
+
+def shift_placeholders(sql: str, shift: int) -> str:
+    """Renumber every $n placeholder in `sql` to $(n + shift) in a single pass"""
+    return _PH_RE.sub(lambda match: f"${int(match.group(1)) + shift}", sql)
+
+
+# Trailing row count of a command status tag such as "UPDATE 17"
+_ROWS_RE = re.compile(r"(\d+)$")
+
+
+def _rows(tag: str) -> int:
+    """Return the number of rows a command status tag reports (0 if it has none)"""
+    match = _ROWS_RE.search(tag)
+    return int(match.group(1)) if match else 0
+
+
+# Window-function column select_records adds to carry the total match count
+TOTAL_COUNT_COLUMN = "__total_count"
+
+
+def split_total_count(row: asyncpg.Record) -> Tuple[Dict[str, Any], int]:
+    """Return a select_records row without its total-count column, and that count"""
+    record = dict(row)
+    return record, record.pop(TOTAL_COUNT_COLUMN)
+
+
+# Generated statements are memoized per call shape, so repeated calls skip
+# the string building and always produce the same text for asyncpg's
+# statement cache to match
+SQL_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=SQL_CACHE_SIZE)
+def _build_insert_sql(
+    schema: str,
+    table_name: str,
+    columns: Tuple[str, ...],
+    returning: bool
+) -> str:
+    """Build an INSERT of one row of `columns`, bound to $1..$n in order"""
+    placeholders = ", ".join(f"${i}" for i in range(1, len(columns) + 1))
+    query = (
+        f"INSERT INTO {_qi(schema)}.{_qi(table_name)} ({', '.join(map(_qi, columns))}) "
+        f"VALUES ({placeholders})"
+    )
+    if returning:
+        query += " RETURNING *"
+    return query
+
+
+@functools.lru_cache(maxsize=SQL_CACHE_SIZE)
+def _build_update_sql(
+    schema: str,
+    table_name: str,
+    columns: Tuple[str, ...],
+    where_clause: str,
+    returning: bool
+) -> str:
+    """
+    Build an UPDATE setting `columns` from $1..$n; the WHERE clause's own
+    placeholders are shifted to follow them
+    """
+    set_clause = ", ".join(f"{_qi(column)} = ${i}" for i, column in enumerate(columns, 1))
+    query = (
+        f"UPDATE {_qi(schema)}.{_qi(table_name)} SET {set_clause} "
+        f"WHERE {shift_placeholders(where_clause, len(columns))}"
+    )
+    if returning:
+        query += " RETURNING *"
+    return query
+
+
+@functools.lru_cache(maxsize=SQL_CACHE_SIZE)
+def _build_select_sql(
+    schema: str,
+    table_name: str,
+    columns: Optional[Tuple[str, ...]],
+    where_clause: Optional[str],
+    where_param_count: int,
+    order_by: Optional[str],
+    has_limit: bool,
+    has_offset: bool
+) -> str:
+    """
+    Build the select_records query for one call shape. A paginated query
+    carries a window count that repeats the number of matching rows on
+    every returned row, so no separate COUNT(*) query is needed; without
+    pagination every matching row is returned and the count is implied.
+    """
+    select_columns = ", ".join(map(_qi, columns)) if columns else "*"
+    if has_limit or has_offset:
+        select_columns += f", COUNT(*) OVER() AS {TOTAL_COUNT_COLUMN}"
+    query = f"SELECT {select_columns} FROM {_qi(schema)}.{_qi(table_name)}"
+    param_index = where_param_count
+
+    if where_clause:
+        query += f" WHERE {where_clause}"
+
+    if order_by:
+        query += f" ORDER BY {order_by}"
+
+    if has_limit:
+        param_index += 1
+        query += f" LIMIT ${param_index}"
+
+    if has_offset:
+        param_index += 1
+        query += f" OFFSET ${param_index}"
+
+    return query
+
+
+# Reads that may return more rows than this go through a server-side cursor
+# and are encoded row by row, so only the encoded rows are held in memory
+# rather than every Record as well. The tool result is still returned whole.
+STREAM_ROW_THRESHOLD = 1000
+
+# Batch inserts of at least this many rows use COPY instead of executemany
+COPY_ROW_THRESHOLD = 500
+
+
 # Create the MCP server with lifespan management
 mcp = FastMCP("PostgreSQL MCP Server", lifespan=server_lifespan)
 
+# Tools return ready-encoded JSON text. FastMCP would otherwise also wrap
+# that string as structured output ({"result": "<the same JSON>"}), sending
+# every payload twice with the second copy escaped, so tools are registered
+# with structured_output=False.
+
 
 # =============================================================================
 # HEALTH CHECK AND UTILITY TOOLS
 # =============================================================================
 
-@mcp.tool()
-async def ping() -> str:
+@mcp.tool(structured_output=False)
+def ping() -> str:
     """Health check for the MCP server"""
-    return "pong"
+    return _PONG
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def get_server_info(ctx: Context) -> str:
     """Get information about the MCP server and database connection"""
     db_ctx: DatabaseContext = ctx.request_context.lifespan_context
 
     try:
-        # Get database version and basic info
-        version_info = await db_ctx.execute_single("SELECT version() as version")
-        db_size = await db_ctx.execute_single(
-            "SELECT pg_size_pretty(pg_database_size($1)) as size",
-            PG_DATABASE
-        )
+        # Get database version and size in one round-trip
+        server_info = await db_ctx.execute_single(SERVER_INFO_QUERY, CONFIG.database)
 
-        result = {
-            "server_name": "PostgreSQL MCP Server",
-            "database": PG_DATABASE,
-            "host": PG_HOST,
-            "port": PG_PORT,
-            "version": version_info["version"] if version_info else "Unknown",
-            "database_size": db_size["size"] if db_size else "Unknown",
+        result = db_ctx.static_info | {
+            "version": server_info["version"] if server_info else "Unknown",
+            "database_size": server_info["size"] if server_info else "Unknown",
             "status": "connected"
         }
-        return json.dumps(result)
+        return db_ctx.to_json(result)
     except Exception as e:
         result = {
-            "server_name": "PostgreSQL MCP Server",
+            "server_name": SERVER_NAME,
             "status": "error",
             "error": str(e)
         }
-        return json.dumps(result)
+        return db_ctx.to_json(result)
 
 
 # =============================================================================
 # SCHEMA INTROSPECTION TOOLS
 # =============================================================================
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def list_tables(ctx: Context, schema: str = "public") -> str:
     """
     List all tables in the specified schema
@@ -195,22 +718,11 @@ async def list_tables(ctx: Context, schema: str = "public") -> str:
     """
     db_ctx: DatabaseContext = ctx.request_context.lifespan_context
 
-    query = """
-        SELECT
-            table_name,
-            table_type,
-            is_insertable_into,
-            is_typed
-        FROM information_schema.tables
-        WHERE table_schema = $1
-        ORDER BY table_name
-    """
+    tables = await db_ctx.execute_query(LIST_TABLES_QUERY, schema)
+    return db_ctx.to_json(tables)
 
-    tables = await db_ctx.execute_query(query, schema)
-    return json.dumps(tables)
 
-
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def describe_table(ctx: Context, table_name: str, schema: str = "public") -> str:
     """
     Get detailed information about a specific table including columns, constraints, and indexes
@@ -224,65 +736,28 @@ async def describe_table(ctx: Context, table_name: str, schema: str = "public")
     """
     db_ctx: DatabaseContext = ctx.request_context.lifespan_context
 
-    # Get column information
-    columns_query = """
-        SELECT
-            column_name,
-            data_type,
-            is_nullable,
-            column_default,
-            character_maximum_length,
-            numeric_precision,
-            numeric_scale,
-            ordinal_position
-        FROM information_schema.columns
-        WHERE table_schema = $1 AND table_name = $2
-        ORDER BY ordinal_position
-    """
-
-    # Get constraints
-    constraints_query = """
-        SELECT
-            tc.constraint_name,
-            tc.constraint_type,
-            ccu.column_name
-        FROM information_schema.table_constraints tc
-        JOIN information_schema.constraint_column_usage ccu
-            ON tc.constraint_name = ccu.constraint_name
-        WHERE tc.table_schema = $1 AND tc.table_name = $2
-    """
-
-    # Get indexes
-    indexes_query = """
-        SELECT
-            indexname,
-            indexdef
-        FROM pg_indexes
-        WHERE schemaname = $1 AND tablename = $2
-    """
-
-    columns = await db_ctx.execute_query(columns_query, schema, table_name)
-    constraints = await db_ctx.execute_query(constraints_query, schema, table_name)
-    indexes = await db_ctx.execute_query(indexes_query, schema, table_name)
+    sections = {"column": [], "constraint": [], "index": []}
+    for row in await db_ctx.execute_query(DESCRIBE_TABLE_QUERY, schema, table_name):
+        sections[row["kind"]].append(row["info"])
 
-    if not columns:
+    if not sections["column"]:
         raise ValueError(f"Table '{schema}.{table_name}' not found")
 
     result = {
         "table_name": table_name,
         "schema": schema,
-        "columns": columns,
-        "constraints": constraints,
-        "indexes": indexes
+        "columns": sections["column"],
+        "constraints": sections["constraint"],
+        "indexes": sections["index"]
     }
-    return json.dumps(result)
+    return db_ctx.to_json(result)
 
 
 # =============================================================================
 # CRUD OPERATIONS
 # =============================================================================
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def insert_record(
     ctx: Context,
     table_name: str,
@@ -307,31 +782,71 @@ async def insert_record(
     if not data:
         raise ValueError("Data dictionary cannot be empty")
 
-    # Build the INSERT query
-    columns = list(data.keys())
-    placeholders = [f"${i+1}" for i in range(len(columns))]
-    values = [data[col] for col in columns]
+    await db_ctx.check_identifiers(schema, table_name, data)
 
-    base_query = f"""
-        INSERT INTO {schema}.{table_name} ({', '.join(columns)})
-        VALUES ({', '.join(placeholders)})
-    """
+    # Sorted so the same column set always yields the same statement text
+    columns = tuple(sorted(data))
+    values = [data[col] for col in columns]
+    query = _build_insert_sql(schema, table_name, columns, return_record)
 
     if return_record:
-        query = base_query + " RETURNING *"
         result = await db_ctx.execute_single(query, *values)
         if result:
-            response = {"success": True, "record": db_ctx.serialize_value(result)}
+            response = {"success": True, "record": result}
         else:
             response = {"success": False, "error": "Failed to insert record"}
     else:
-        result = await db_ctx.execute_command(base_query, *values)
-        response = {"success": True, "rows_affected": int(result.split()[-1])}
+        result = await db_ctx.execute_command(query, *values)
+        response = {"success": True, "rows_affected": _rows(result)}
+
+    return db_ctx.to_json(response)
+
+
+@mcp.tool(structured_output=False)
+async def insert_records(
+    ctx: Context,
+    table_name: str,
+    data: List[Dict[str, Any]],
+    schema: str = "public"
+) -> str:
+    """
+    Insert multiple records into the specified table in a single batch
+
+    Args:
+        table_name: Name of the table to insert into
+        data: List of dictionaries of column names and values; every record must have the same columns
+        schema: Database schema name (default: 'public')
+
+    Returns:
+        Dictionary containing the operation status and number of inserted records
+    """
+    db_ctx: DatabaseContext = ctx.request_context.lifespan_context
+
+    if not data:
+        raise ValueError("Data list cannot be empty")
+
+    column_set = data[0].keys()
+    if not column_set:
+        raise ValueError("Data records cannot be empty")
+
+    for index, record in enumerate(data):
+        if record.keys() != column_set:
+            raise ValueError(f"Record {index} does not have the same columns as the first record")
+
+    columns = tuple(sorted(column_set))
+    await db_ctx.check_identifiers(schema, table_name, columns)
+    rows = [tuple(record[col] for col in columns) for record in data]
+
+    if len(rows) >= COPY_ROW_THRESHOLD:
+        await db_ctx.copy_records(table_name, rows, list(columns), schema)
+    else:
+        query = _build_insert_sql(schema, table_name, columns, False)
+        await db_ctx.execute_many(query, rows)
 
-    return json.dumps(response)
+    return db_ctx.to_json({"success": True, "rows_affected": len(rows)})
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def select_records(
     ctx: Context,
     table_name: str,
@@ -361,51 +876,79 @@ async def select_records(
     """
     db_ctx: DatabaseContext = ctx.request_context.lifespan_context
 
-    # Build the SELECT query
-    select_columns = ", ".join(columns) if columns else "*"
-    query = f"SELECT {select_columns} FROM {schema}.{table_name}"
-    params = []
-
-    if where_clause:
-        query += f" WHERE {where_clause}"
-        if where_params:
-            params.extend(where_params)
+    await db_ctx.check_identifiers(schema, table_name, columns or ())
 
-    if order_by:
-        query += f" ORDER BY {order_by}"
+    params = list(where_params) if where_clause and where_params else []
+    query = _build_select_sql(
+        schema,
+        table_name,
+        tuple(columns) if columns else None,
+        where_clause,
+        len(params),
+        order_by,
+        limit is not None,
+        offset is not None
+    )
 
     if limit is not None:
-        query += f" LIMIT ${len(params) + 1}"
         params.append(limit)
 
     if offset is not None:
-        query += f" OFFSET ${len(params) + 1}"
         params.append(offset)
 
-    records = await db_ctx.execute_query(query, *params)
-
-    # Get total count for pagination info
-    count_query = f"SELECT COUNT(*) as total FROM {schema}.{table_name}"
-    if where_clause:
-        count_query += f" WHERE {where_clause}"
-        count_params = where_params or []
-    else:
-        count_params = []
-
-    count_result = await db_ctx.execute_single(count_query, *count_params)
-    total_count = count_result["total"] if count_result else 0
+    paginated = limit is not None or offset is not None
+    total_count = 0
+    async with db_ctx.session() as session:
+        if limit is None or limit > STREAM_ROW_THRESHOLD:
+            records = None
+            encoded_records = []
+            async for row in session.iter_query(query, *params):
+                if paginated:
+                    row, total_count = split_total_count(row)
+                encoded_records.append(db_ctx.encode_record(row))
+            returned_count = len(encoded_records)
+        else:
+            records = await session.fetch(query, *params)
+            if paginated and records:
+                total_count = records[0][TOTAL_COUNT_COLUMN]
+                records = [split_total_count(row)[0] for row in records]
+            returned_count = len(records)
+
+        if not paginated:
+            total_count = returned_count
+
+        # An empty page (limit 0, or an offset past the last row) leaves no
+        # row to read the total from
+        if paginated and not returned_count:
+            count_query = f"SELECT COUNT(*) FROM {_qi(schema)}.{_qi(table_name)}"
+            if where_clause:
+                count_query += f" WHERE {where_clause}"
+                count_params = where_params or []
+            else:
+                count_params = []
+
+            total_count = await session.fetchval(count_query, *count_params) or 0
+
+    if records is None:
+        return db_ctx.encode_records_response(
+            encoded_records,
+            total_count=total_count,
+            returned_count=returned_count,
+            limit=limit,
+            offset=offset or 0
+        )
 
     result = {
-        "records": [db_ctx.serialize_value(record) for record in records],
+        "records": records,
         "total_count": total_count,
-        "returned_count": len(records),
+        "returned_count": returned_count,
         "limit": limit,
         "offset": offset or 0
     }
-    return json.dumps(result)
+    return db_ctx.to_json(result)
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def update_records(
     ctx: Context,
     table_name: str,
@@ -437,46 +980,29 @@ async def update_records(
     if not where_clause:
         raise ValueError("WHERE clause is required for UPDATE operations for safety")
 
-    # Build the UPDATE query
-    set_clauses = []
-    values = []
-    param_index = 1
-
-    for column, value in data.items():
-        set_clauses.append(f"{column} = ${param_index}")
-        values.append(value)
-        param_index += 1
+    await db_ctx.check_identifiers(schema, table_name, data)
 
-    # Add WHERE parameters
+    # Sorted so the same column set always yields the same statement text
+    columns = tuple(sorted(data))
+    values = [data[col] for col in columns]
     values.extend(where_params)
-
-    # Adjust WHERE clause parameter indices
-    adjusted_where = where_clause
-    for i, _ in enumerate(where_params):
-        adjusted_where = adjusted_where.replace(f"${i+1}", f"${param_index + i}")
-
-    base_query = f"""
-        UPDATE {schema}.{table_name}
-        SET {', '.join(set_clauses)}
-        WHERE {adjusted_where}
-    """
+    query = _build_update_sql(schema, table_name, columns, where_clause, return_records)
 
     if return_records:
-        query = base_query + " RETURNING *"
         records = await db_ctx.execute_query(query, *values)
         result = {
             "success": True,
-            "records": [db_ctx.serialize_value(record) for record in records],
+            "records": records,
             "rows_affected": len(records)
         }
     else:
-        command_result = await db_ctx.execute_command(base_query, *values)
-        result = {"success": True, "rows_affected": int(command_result.split()[-1])}
+        command_result = await db_ctx.execute_command(query, *values)
+        result = {"success": True, "rows_affected": _rows(command_result)}
 
-    return json.dumps(result)
+    return db_ctx.to_json(result)
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def delete_records(
     ctx: Context,
     table_name: str,
@@ -503,33 +1029,36 @@ async def delete_records(
     if not where_clause:
         raise ValueError("WHERE clause is required for DELETE operations for safety")
 
-    base_query = f"DELETE FROM {schema}.{table_name} WHERE {where_clause}"
+    await db_ctx.check_identifiers(schema, table_name)
+
+    base_query = f"DELETE FROM {_qi(schema)}.{_qi(table_name)} WHERE {where_clause}"
 
     if return_records:
         query = base_query + " RETURNING *"
         records = await db_ctx.execute_query(query, *where_params)
         result = {
             "success": True,
-            "records": [db_ctx.serialize_value(record) for record in records],
+            "records": records,
             "rows_affected": len(records)
         }
     else:
         command_result = await db_ctx.execute_command(base_query, *where_params)
-        result = {"success": True, "rows_affected": int(command_result.split()[-1])}
+        result = {"success": True, "rows_affected": _rows(command_result)}
 
-    return json.dumps(result)
+    return db_ctx.to_json(result)
 
 
 # =============================================================================
 # ADVANCED QUERY TOOLS
 # =============================================================================
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def execute_custom_query(
     ctx: Context,
     query: str,
     params: Optional[List[Any]] = None,
-    query_type: str = "SELECT"
+    query_type: str = "SELECT",
+    force_custom_plan: bool = False
 ) -> str:
     """
     Execute a custom SQL query with parameters
@@ -538,6 +1067,9 @@ async def execute_custom_query(
         query: SQL query to execute
         params: Optional parameters for the query
         query_type: Type of query (SELECT, INSERT, UPDATE, DELETE) for safety
+        force_custom_plan: Plan the query for these specific parameters instead of
+            reusing a cached generic plan; use when the best plan depends on the
+            parameter values (e.g. skewed data)
 
     Returns:
         Query results or execution status
@@ -548,34 +1080,52 @@ async def execute_custom_query(
     """
     db_ctx: DatabaseContext = ctx.request_context.lifespan_context
 
-    if not query.strip():
+    # asyncpg caches prepared statements by exact query text, so submissions
+    # that differ only in surrounding whitespace or a trailing semicolon
+    # would otherwise be parsed and planned separately. After a few runs
+    # PostgreSQL may switch a cached statement to a generic plan, which
+    # force_custom_plan opts out of.
+    query = normalize_query(query)
+    if not query:
         raise ValueError("Query cannot be empty")
 
-    # Basic safety check
-    query_upper = query.strip().upper()
+    # Basic safety check; only the leading keyword is case-folded, since
+    # normalize_query already stripped leading whitespace
     if query_type.upper() == "SELECT":
-        if not query_upper.startswith("SELECT"):
+        if query[:6].upper() != "SELECT":
             raise ValueError("Query must start with SELECT for query_type='SELECT'")
 
-        results = await db_ctx.execute_query(query, *(params or []))
-        result = {
-            "success": True,
-            "records": [db_ctx.serialize_value(record) for record in results],
-            "record_count": len(results)
-        }
+        # The result size is unknown, so always read through a cursor. JIT
+        # is off for the server's own catalog queries, but may pay off for
+        # long analytical SQL, so it is turned back on for custom SELECTs.
+        encoded_records = [
+            db_ctx.encode_record(row)
+            async for row in db_ctx.iter_query(
+                query, *(params or []), force_custom_plan=force_custom_plan, jit=True
+            )
+        ]
+        return db_ctx.encode_records_response(
+            encoded_records,
+            success=True,
+            record_count=len(encoded_records)
+        )
     else:
         # For non-SELECT queries
-        command_result = await db_ctx.execute_command(query, *(params or []))
+        if force_custom_plan:
+            async with db_ctx.session() as session, session.transaction(force_custom_plan=True):
+                command_result = await session.execute(query, *(params or []))
+        else:
+            command_result = await db_ctx.execute_command(query, *(params or []))
         result = {
             "success": True,
             "result": command_result,
-            "rows_affected": int(command_result.split()[-1]) if command_result.split()[-1].isdigit() else 0
+            "rows_affected": _rows(command_result)
         }
 
-    return json.dumps(result)
+    return db_ctx.to_json(result)
 
 
-@mcp.tool()
+@mcp.tool(structured_output=False)
 async def get_table_statistics(ctx: Context, table_name: str, schema: str = "public") -> str:
     """
     Get statistics about a table including row count, size, and column statistics
@@ -589,50 +1139,37 @@ async def get_table_statistics(ctx: Context, table_name: str, schema: str = "pub
     """
     db_ctx: DatabaseContext = ctx.request_context.lifespan_context
 
-    # Get basic table info
-    table_info_query = """
-        SELECT
-            schemaname,
-            tablename,
-            tableowner,
-            hasindexes,
-            hasrules,
-            hastriggers
-        FROM pg_tables
-        WHERE schemaname = $1 AND tablename = $2
-    """
-
     # Get row count
-    count_query = f"SELECT COUNT(*) as row_count FROM {schema}.{table_name}"
-
-    # Get table size
-    size_query = """
-        SELECT
-            pg_size_pretty(pg_total_relation_size($1)) as total_size,
-            pg_size_pretty(pg_relation_size($1)) as table_size,
-            pg_size_pretty(pg_total_relation_size($1) - pg_relation_size($1)) as index_size
-    """
+    qualified_name = f"{_qi(schema)}.{_qi(table_name)}"
+    count_query = f"SELECT COUNT(*) FROM {qualified_name}"
 
-    table_info = await db_ctx.execute_single(table_info_query, schema, table_name)
-    row_count = await db_ctx.execute_single(count_query)
-    size_info = await db_ctx.execute_single(size_query, f"{schema}.{table_name}")
+    # The three queries are independent, so each runs on its own pooled
+    # connection and the call waits for one round-trip instead of three
+    table_info, row_count, size_info = await asyncio.gather(
+        db_ctx.execute_single(TABLE_INFO_QUERY, schema, table_name),
+        db_ctx.execute_scalar(count_query),
+        db_ctx.execute_single(TABLE_SIZE_QUERY, qualified_name)
+    )
 
     if not table_info:
         raise ValueError(f"Table '{schema}.{table_name}' not found")
 
     result = {
         "table_info": table_info,
-        "row_count": row_count["row_count"] if row_count else 0,
+        "row_count": row_count or 0,
         "size_info": size_info or {}
     }
-    return json.dumps(result)
+    return db_ctx.to_json(result)
 
 
 def main():
     """Main entry point for the MCP server"""
     try:
         logger.info("Starting PostgreSQL MCP Server...")
-        mcp.run()
+        if uvloop is not None:
+            uvloop.run(mcp.run_stdio_async())
+        else:
+            mcp.run()
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
@@ -0,0 +1,77 @@
+"""
+Shared Test Fixtures for PostgreSQL MCP Server
+
+Fixtures used by more than one test module.
+"""
+
+import asyncio
+
+import asyncpg
+import pytest_asyncio
+from mcp.client.session import ClientSession
+from mcp.client.stdio import StdioServerParameters, stdio_client
+
+from db.config import CONFIG
+
+# The libuv-based event loop is not available on Windows
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+SERVER_PARAMS = StdioServerParameters(
+    command="python",
+    args=["postgres_mcp_server.py"]
+)
+
+
+if uvloop is not None:
+    def pytest_asyncio_loop_factories(config, item):
+        """Run async tests and fixtures on uvloop, like the server itself"""
+        return {"uvloop": uvloop.new_event_loop}
+
+
+@pytest_asyncio.fixture(scope="session")
+async def mcp_session():
+    """
+    Start the server once and share one initialized MCP client session
+    across all tests.
+
+    stdio_client and ClientSession hold anyio cancel scopes that must be
+    entered and exited by the same task, while pytest-asyncio sets up and
+    tears down fixtures from different tasks, so the client lives in a
+    dedicated task that runs until teardown.
+    """
+    started = asyncio.get_running_loop().create_future()
+    stop = asyncio.Event()
+
+    async def run_client():
+        async with stdio_client(SERVER_PARAMS) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                started.set_result(session)
+                await stop.wait()
+
+    client_task = asyncio.create_task(run_client())
+    await asyncio.wait({started, client_task}, return_when=asyncio.FIRST_COMPLETED)
+    if not started.done():
+        # The server failed to start; re-raise the client's error
+        await client_task
+
+    yield started.result()
+
+    stop.set()
+    await client_task
+
+
+@pytest_asyncio.fixture(scope="session")
+async def pg_pool():
+    """Small connection pool shared by the tests that talk to PostgreSQL directly"""
+    pool = await asyncpg.create_pool(
+        **CONFIG.connect_kwargs(),
+        min_size=2,
+        max_size=4,
+        statement_cache_size=100,
+    )
+    yield pool
+    await pool.close()
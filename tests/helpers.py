@@ -0,0 +1,12 @@
+"""
+Shared Test Helpers for PostgreSQL MCP Server
+
+Plain functions used by more than one test module.
+"""
+
+import orjson
+
+
+def tool_json(result):
+    """Decode the JSON text returned by a tool"""
+    return orjson.loads(result.content[0].text)
@@ -6,134 +6,213 @@ Tests for create, read, update, and delete operations using the MCP client.
 
 import pytest
 import asyncio
-import json
-from mcp.client.session import ClientSession
-from mcp.client.stdio import StdioServerParameters, stdio_client
+from uuid import uuid4
 
-
-@pytest.fixture
-async def mcp_session():
-    """Create an MCP client session for testing"""
-    server_params = StdioServerParameters(
-        command="python",
-        args=["postgres_mcp_server.py"]
-    )
-
-    async with stdio_client(server_params) as (read, write):
-        async with ClientSession(read, write) as session:
-            await session.initialize()
-            yield session
+from postgres_mcp_server import COPY_ROW_THRESHOLD
+from tests.helpers import tool_json
 
 
 @pytest.mark.asyncio
-async def test_insert_record(mcp_session):
-    """Test inserting a new record"""
+async def test_crud_lifecycle(mcp_session):
+    """Test inserting, selecting, updating and deleting one record"""
+    name = f"Test Item {uuid4().hex[:8]}"
     insert_data = {
-        "name": "Test Item",
+        "name": name,
         "description": "This is a test item"
     }
 
-    result = await mcp_session.call_tool("insert_record", {
-        "table_name": "items",
-        "data": insert_data
-    })
-
-    response = json.loads(result.content[0].text)
-    assert response["success"] is True
-    assert "record" in response
-    assert response["record"]["name"] == "Test Item"
-    assert response["record"]["description"] == "This is a test item"
-    assert isinstance(response["record"]["id"], int)
-
-
-@pytest.mark.asyncio
-async def test_select_records(mcp_session):
-    """Test selecting records with filtering"""
-    # First insert a test record
-    insert_data = {"name": "Select Test Item", "description": "For select testing"}
-
     insert_result = await mcp_session.call_tool("insert_record", {
         "table_name": "items",
         "data": insert_data
     })
 
-    insert_response = json.loads(insert_result.content[0].text)
+    insert_response = tool_json(insert_result)
+    assert insert_response["success"] is True
+    assert "record" in insert_response
+    assert insert_response["record"]["name"] == name
+    assert insert_response["record"]["description"] == "This is a test item"
+    assert isinstance(insert_response["record"]["id"], int)
     record_id = insert_response["record"]["id"]
 
-    # Now select the record
+    # Select the record back by id
     select_result = await mcp_session.call_tool("select_records", {
         "table_name": "items",
         "where_clause": "id = $1",
         "where_params": [record_id]
     })
 
-    select_response = json.loads(select_result.content[0].text)
+    select_response = tool_json(select_result)
     assert select_response["returned_count"] == 1
     assert len(select_response["records"]) == 1
-    assert select_response["records"][0]["name"] == "Select Test Item"
-
-
-@pytest.mark.asyncio
-async def test_update_records(mcp_session):
-    """Test updating records"""
-    # First insert a test record
-    insert_data = {"name": "Update Test Item", "description": "Original description"}
-
-    insert_result = await mcp_session.call_tool("insert_record", {
-        "table_name": "items",
-        "data": insert_data
-    })
-
-    insert_response = json.loads(insert_result.content[0].text)
-    record_id = insert_response["record"]["id"]
-
-    # Update the record
-    update_data = {"description": "Updated description"}
+    assert select_response["records"][0]["name"] == name
 
+    # Update it
     update_result = await mcp_session.call_tool("update_records", {
         "table_name": "items",
-        "data": update_data,
+        "data": {"description": "Updated description"},
         "where_clause": "id = $1",
         "where_params": [record_id]
     })
 
-    update_response = json.loads(update_result.content[0].text)
+    update_response = tool_json(update_result)
     assert update_response["success"] is True
     assert update_response["rows_affected"] == 1
     assert update_response["records"][0]["description"] == "Updated description"
 
-
-@pytest.mark.asyncio
-async def test_delete_records(mcp_session):
-    """Test deleting records"""
-    # First insert a test record
-    insert_data = {"name": "Delete Test Item", "description": "To be deleted"}
-
-    insert_result = await mcp_session.call_tool("insert_record", {
+    # Update with several WHERE placeholders, which are renumbered after the SET values
+    update_result = await mcp_session.call_tool("update_records", {
         "table_name": "items",
-        "data": insert_data
+        "data": {"description": "Updated again"},
+        "where_clause": "id = $1 AND name = $2",
+        "where_params": [record_id, name]
     })
 
-    insert_response = json.loads(insert_result.content[0].text)
-    record_id = insert_response["record"]["id"]
+    update_response = tool_json(update_result)
+    assert update_response["success"] is True
+    assert update_response["rows_affected"] == 1
+    assert update_response["records"][0]["description"] == "Updated again"
 
-    # Delete the record
+    # Delete the record; the returned rows show exactly what was removed
     delete_result = await mcp_session.call_tool("delete_records", {
         "table_name": "items",
         "where_clause": "id = $1",
-        "where_params": [record_id]
+        "where_params": [record_id],
+        "return_records": True
     })
 
-    delete_response = json.loads(delete_result.content[0].text)
+    delete_response = tool_json(delete_result)
     assert delete_response["success"] is True
     assert delete_response["rows_affected"] == 1
+    assert [record["id"] for record in delete_response["records"]] == [record_id]
 
-    # Verify the record is deleted
-    select_result = await mcp_session.call_tool("select_records", {
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("row_count", [2, COPY_ROW_THRESHOLD], ids=["executemany", "copy"])
+async def test_insert_records(mcp_session, row_count):
+    """Test inserting several records in one batch"""
+    suffix = uuid4().hex[:8]
+    insert_data = [
+        {"name": f"Batch Item {i} {suffix}", "description": f"Batch item {i}"}
+        for i in range(row_count)
+    ]
+    names = [record["name"] for record in insert_data]
+
+    try:
+        result = await mcp_session.call_tool("insert_records", {
+            "table_name": "items",
+            "data": insert_data
+        })
+
+        response = tool_json(result)
+        assert response["success"] is True
+        assert response["rows_affected"] == row_count
+
+        # Read the rows back to check they actually landed
+        select_result = await mcp_session.call_tool("select_records", {
+            "table_name": "items",
+            "columns": ["name", "description"],
+            "where_clause": "name = ANY($1)",
+            "where_params": [names],
+            "order_by": "id"
+        })
+
+        assert tool_json(select_result)["records"] == insert_data
+    finally:
+        await mcp_session.call_tool("delete_records", {
+            "table_name": "items",
+            "where_clause": "name = ANY($1)",
+            "where_params": [names]
+        })
+
+
+@pytest.mark.asyncio
+async def test_insert_records_empty_record(mcp_session):
+    """Test that records without any columns are rejected"""
+    result = await mcp_session.call_tool("insert_records", {
         "table_name": "items",
-        "where_clause": "id = $1",
-        "where_params": [record_id]
+        "data": [{}]
+    })
+
+    assert result.isError is True
+    assert "cannot be empty" in result.content[0].text
+
+
+@pytest.mark.asyncio
+async def test_insert_records_copy_jsonb(mcp_session):
+    """Test a batch large enough to be loaded with COPY into a table with a jsonb column"""
+    batch = uuid4().hex[:8]
+    metadata = [{"batch": batch, "index": i} for i in range(COPY_ROW_THRESHOLD)]
+    insert_data = [
+        {"name": f"Copy Product {i}", "metadata": value}
+        for i, value in enumerate(metadata)
+    ]
+    # JSON text is passed through unchanged
+    insert_data[0]["metadata"] = f'{{"batch": "{batch}", "index": 0}}'
+
+    try:
+        result = await mcp_session.call_tool("insert_records", {
+            "table_name": "products",
+            "data": insert_data
+        })
+
+        response = tool_json(result)
+        assert response["success"] is True
+        assert response["rows_affected"] == COPY_ROW_THRESHOLD
+
+        select_result = await mcp_session.call_tool("select_records", {
+            "table_name": "products",
+            "columns": ["metadata"],
+            "where_clause": "metadata->>'batch' = $1",
+            "where_params": [batch],
+            "order_by": "id"
+        })
+
+        records = tool_json(select_result)["records"]
+        assert [record["metadata"] for record in records] == metadata
+    finally:
+        await mcp_session.call_tool("delete_records", {
+            "table_name": "products",
+            "where_clause": "metadata->>'batch' = $1",
+            "where_params": [batch]
+        })
+
+
+@pytest.mark.asyncio
+async def test_insert_records_mismatched_columns(mcp_session):
+    """Test that a batch whose records have different columns is rejected"""
+    result = await mcp_session.call_tool("insert_records", {
+        "table_name": "items",
+        "data": [
+            {"name": "Batch Item 1", "description": "First batch item"},
+            {"name": "Batch Item 2"}
+        ]
+    })
+
+    assert result.isError is True
+    assert "same columns" in result.content[0].text
+
+
+@pytest.mark.asyncio
+async def test_select_records_unknown_column(mcp_session):
+    """Test that columns missing from the table are rejected before querying"""
+    result = await mcp_session.call_tool("select_records", {
+        "table_name": "items",
+        "columns": ["id", "no_such_column"]
+    })
+
+    assert result.isError is True
+    assert "no_such_column" in result.content[0].text
+
+
+@pytest.mark.asyncio
+async def test_select_records_empty_page_total(mcp_session):
+    """Test that an empty page still reports the table's total row count"""
+    result = await mcp_session.call_tool("select_records", {
+        "table_name": "users",
+        "limit": 0
     })
 
-    select_response = json.loads(select_result.content[0].text)
-    assert select_response["returned_count"] == 0
\ No newline at end of file
+    response = tool_json(result)
+    assert response["returned_count"] == 0
+    assert response["records"] == []
+    assert response["total_count"] >= 3  # The 3 sample users
\ No newline at end of file
@@ -5,103 +5,72 @@ Tests for database connectivity and basic database operations.
 """
 
 import pytest
-import asyncpg
-import os
-from dotenv import load_dotenv
-from db.connection import test_connection, get_database_info
+from db import connection as db_connection
+from db.config import CONFIG
 
-load_dotenv()
+EXPECTED_TABLES = ['items', 'products', 'users', 'orders', 'order_items']
 
 
 @pytest.mark.asyncio
-async def test_database_connection():
+async def test_database_connection(pg_pool):
     """Test basic database connection"""
-    # Create a direct connection for this test
-    conn = await asyncpg.connect(
-        host=os.getenv("PG_HOST", "localhost"),
-        port=int(os.getenv("PG_PORT", 5432)),
-        user=os.getenv("PG_USER"),
-        password=os.getenv("PG_PASSWORD"),
-        database=os.getenv("PG_DATABASE"),
-    )
-    try:
-        result = await conn.fetchval("SELECT 1;")
-        assert result == 1
-    finally:
-        await conn.close()
+    async with pg_pool.acquire() as conn:
+        result = await conn.fetchval("SELECT 1")
+    assert result == 1
 
 
 @pytest.mark.asyncio
 async def test_connection_utility():
     """Test the connection utility function"""
-    is_connected = await test_connection()
+    is_connected = await db_connection.test_connection()
     assert is_connected is True
 
 
 @pytest.mark.asyncio
 async def test_database_info():
     """Test getting database information"""
-    db_info = await get_database_info()
+    db_info = await db_connection.get_database_info()
 
     assert "host" in db_info
     assert "port" in db_info
     assert "database" in db_info
-    assert db_info["host"] == os.getenv("PG_HOST", "localhost")
-    assert db_info["port"] == int(os.getenv("PG_PORT", 5432))
-    assert db_info["database"] == os.getenv("PG_DATABASE")
+    assert db_info["host"] == CONFIG.host
+    assert db_info["port"] == CONFIG.port
+    assert db_info["database"] == CONFIG.database
 
 
 @pytest.mark.asyncio
-async def test_schema_exists():
+async def test_schema_exists(pg_pool):
     """Test that the required schema exists"""
-    conn = await asyncpg.connect(
-        host=os.getenv("PG_HOST", "localhost"),
-        port=int(os.getenv("PG_PORT", 5432)),
-        user=os.getenv("PG_USER"),
-        password=os.getenv("PG_PASSWORD"),
-        database=os.getenv("PG_DATABASE"),
-    )
-
-    try:
-        # Check that required tables exist
-        tables = await conn.fetch("""
-            SELECT table_name
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_name IN ('items', 'products', 'users', 'orders', 'order_items')
-        """)
-
-        table_names = [row['table_name'] for row in tables]
-        expected_tables = ['items', 'products', 'users', 'orders', 'order_items']
-
-        for expected_table in expected_tables:
-            assert expected_table in table_names, f"Table '{expected_table}' not found"
-
-    finally:
-        await conn.close()
+    # Ask the server which of the required tables are missing
+    async with pg_pool.acquire() as conn:
+        missing = await conn.fetchval("""
+            SELECT array_agg(t)
+            FROM unnest($1::text[]) AS t
+            WHERE NOT EXISTS (
+                SELECT 1
+                FROM information_schema.tables
+                WHERE table_schema = 'public'
+                AND table_name = t
+            )
+        """, EXPECTED_TABLES)
+
+    assert not missing, f"Tables not found: {missing}"
 
 
 @pytest.mark.asyncio
-async def test_sample_data_exists():
+async def test_sample_data_exists(pg_pool):
     """Test that sample data exists in the database"""
-    conn = await asyncpg.connect(
-        host=os.getenv("PG_HOST", "localhost"),
-        port=int(os.getenv("PG_PORT", 5432)),
-        user=os.getenv("PG_USER"),
-        password=os.getenv("PG_PASSWORD"),
-        database=os.getenv("PG_DATABASE"),
-    )
-
-    try:
-        # Check that sample data exists
-        items_count = await conn.fetchval("SELECT COUNT(*) FROM items")
-        users_count = await conn.fetchval("SELECT COUNT(*) FROM users")
-        products_count = await conn.fetchval("SELECT COUNT(*) FROM products")
-
-        # Should have at least some sample data
-        assert items_count >= 0  # May be 0 if tests have cleaned up
-        assert users_count >= 3  # Should have the 3 sample users
-        assert products_count >= 4  # Should have the 4 sample products
-
-    finally:
-        await conn.close()
\ No newline at end of file
+    # Check that sample data exists, counting all three tables in one query
+    async with pg_pool.acquire() as conn:
+        counts = await conn.fetchrow("""
+            SELECT
+                (SELECT COUNT(*) FROM items) AS items,
+                (SELECT COUNT(*) FROM users) AS users,
+                (SELECT COUNT(*) FROM products) AS products
+        """)
+
+    # Should have at least some sample data
+    assert counts["items"] >= 0  # May be 0 if tests have cleaned up
+    assert counts["users"] >= 3  # Should have the 3 sample users
+    assert counts["products"] >= 4  # Should have the 4 sample products
\ No newline at end of file
@@ -6,23 +6,23 @@ Tests for the PostgreSQL MCP server using the official MCP client.
 
 import pytest
 import asyncio
-import json
-from mcp.client.session import ClientSession
-from mcp.client.stdio import StdioServerParameters, stdio_client
 
+from tests.helpers import tool_json
 
-@pytest.fixture
-async def mcp_session():
-    """Create an MCP client session for testing"""
-    server_params = StdioServerParameters(
-        command="python",
-        args=["postgres_mcp_server.py"]
-    )
 
-    async with stdio_client(server_params) as (read, write):
-        async with ClientSession(read, write) as session:
-            await session.initialize()
-            yield session
+EXPECTED_TOOLS = frozenset([
+    "ping",
+    "get_server_info",
+    "list_tables",
+    "describe_table",
+    "insert_record",
+    "insert_records",
+    "select_records",
+    "update_records",
+    "delete_records",
+    "execute_custom_query",
+    "get_table_statistics"
+])
 
 
 @pytest.mark.asyncio
@@ -36,7 +36,7 @@ async def test_ping(mcp_session):
 async def test_get_server_info(mcp_session):
     """Test getting server information"""
     result = await mcp_session.call_tool("get_server_info", {})
-    server_info = json.loads(result.content[0].text)
+    server_info = tool_json(result)
 
     assert "server_name" in server_info
     assert "status" in server_info
@@ -47,20 +47,15 @@ async def test_get_server_info(mcp_session):
 async def test_list_tools(mcp_session):
     """Test that all expected tools are available"""
     tools = await mcp_session.list_tools()
-    tool_names = [tool.name for tool in tools.tools]
+    tool_names = {tool.name for tool in tools.tools}
 
-    expected_tools = [
-        "ping",
-        "get_server_info",
-        "list_tables",
-        "describe_table",
-        "insert_record",
-        "select_records",
-        "update_records",
-        "delete_records",
-        "execute_custom_query",
-        "get_table_statistics"
-    ]
+    assert EXPECTED_TOOLS <= tool_names, f"Tools not found: {sorted(EXPECTED_TOOLS - tool_names)}"
 
-    for expected_tool in expected_tools:
-        assert expected_tool in tool_names, f"Tool '{expected_tool}' not found"
\ No newline at end of file
+@pytest.mark.asyncio
+async def test_execute_custom_query_jit(mcp_session):
+    """Test that custom SELECTs run with JIT, which the pool disables for the server's own queries"""
+    result = await mcp_session.call_tool("execute_custom_query", {
+        "query": "SELECT current_setting('jit') AS jit"
+    })
+
+    assert tool_json(result)["records"] == [{"jit": "on"}]
\ No newline at end of file